@@ -1,12 +1,11 @@
 // app/api/analyze/route.ts
 import { NextResponse } from "next/server";
-import { ParsedData, Node, Edge } from "@/lib/parsers/babel"; // Re-using interfaces
-import { parseBabelCode } from "@/lib/parsers/babel";
-import { parsePythonCode } from "@/lib/parsers/python";
+import { ParsedData, Node, Edge, getParserForExtension } from "@/lib/parsers";
+import { hashContent, getCachedParse, setCachedParse } from "@/lib/parseCache";
 import { simpleGit } from "simple-git";
 import { globby } from "globby";
 import path from "path";
-import fs from "fs/promises";
+import fs, { type FileHandle } from "fs/promises";
 import os from "os";
 
 export const dynamic = "force-dynamic"; // Ensure this API route is dynamic
@@ -23,6 +22,135 @@ const uniqueItems = <T extends { id: string }>(items: T[]): T[] => {
   });
 };
 
+// Directories never worth descending into, wherever they appear in the tree
+const IGNORED_DIRECTORIES = [
+  "node_modules",
+  ".git",
+  ".next",
+  "out", // Next.js export directory
+  "dist", // Common build directory
+  "build",
+  "coverage",
+  "__pycache__",
+  ".venv",
+  "venv",
+  ".mypy_cache",
+  ".pytest_cache",
+];
+
+// Turns root .gitignore entries into `ignore` globs so globby prunes those
+// directories during the walk; `gitignore: true` only filters results after
+// the fact. Files with negations are left entirely to that filter, because
+// pruning could drop a path a later `!` entry re-includes. Entries with
+// escapes or character classes are left to it as well.
+const readGitignorePrunePatterns = async (baseDir: string): Promise<string[]> => {
+  let content: string;
+  try {
+    content = await fs.readFile(path.join(baseDir, ".gitignore"), "utf-8");
+  } catch {
+    return [];
+  }
+  const entries = content
+    .split("\n")
+    .map((line) => line.trim())
+    .filter((line) => line && !line.startsWith("#"));
+  if (entries.some((entry) => entry.startsWith("!"))) {
+    return [];
+  }
+  const patterns: string[] = [];
+  for (const entry of entries) {
+    if (/[\\[\]]/.test(entry)) continue;
+    const pattern = entry.replace(/\/+$/, "");
+    if (!pattern) continue;
+    // A slash before the end anchors the entry to the repository root;
+    // otherwise it matches at any depth, like IGNORED_DIRECTORIES
+    patterns.push(
+      pattern.includes("/")
+        ? `${pattern.replace(/^\/+/, "")}/**`
+        : `**/${pattern}/**`
+    );
+  }
+  return patterns;
+};
+
+// Number of files read and parsed at the same time
+const FILE_CONCURRENCY = 16;
+
+// Utility to run an async mapper over items with a bounded number in flight.
+// Results keep the order of the input items.
+const mapWithConcurrency = async <T, R>(
+  items: T[],
+  limit: number,
+  mapper: (item: T) => Promise<R>
+): Promise<R[]> => {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await mapper(items[index]);
+    }
+  };
+  await Promise.all(
+    Array.from({ length: Math.min(limit, items.length) }, worker)
+  );
+  return results;
+};
+
+// Files larger than this are listed in the graph but not read or parsed
+const MAX_FILE_SIZE_BYTES = 1024 * 1024;
+
+// Reads and parses a single file. Errors are logged and yield empty data
+// so one bad file doesn't abort the whole analysis.
+const analyzeFile = async (
+  baseDir: string,
+  filePath: string
+): Promise<ParsedData> => {
+  const relativeFilePath = path.relative(baseDir, filePath);
+  const fileExtension = path.extname(filePath);
+  let currentParsedData: ParsedData = { nodes: [], edges: [] };
+
+  let fileHandle: FileHandle | undefined;
+  try {
+    fileHandle = await fs.open(filePath, "r");
+    const { size } = await fileHandle.stat();
+    if (size > MAX_FILE_SIZE_BYTES) {
+      // Most likely generated or bundled code; keep its file node but skip
+      // buffering and parsing it whole
+      console.log(`Skipping parse of large file ${filePath} (${size} bytes)`);
+      currentParsedData.nodes.push({
+        id: relativeFilePath,
+        data: { label: relativeFilePath, type: "file" },
+      });
+      return currentParsedData;
+    }
+    const fileBuffer = await fileHandle.readFile();
+
+    // Reuse the previous parse if this file's content hasn't changed.
+    // Hashing the raw bytes means cache hits never pay for UTF-8 decoding.
+    const digest = hashContent(fileBuffer);
+    const cachedParsedData = await getCachedParse(relativeFilePath, digest);
+
+    if (cachedParsedData) {
+      currentParsedData = cachedParsedData;
+    } else {
+      const parse = getParserForExtension(fileExtension);
+      if (parse) {
+        currentParsedData = parse(relativeFilePath, fileBuffer.toString("utf-8"));
+      }
+      setCachedParse(relativeFilePath, digest, currentParsedData);
+    }
+  } catch (fileReadError) {
+    console.error(`Error processing file ${filePath}:`, fileReadError);
+  } finally {
+    await fileHandle?.close().catch((closeError) => {
+      console.error(`Error closing file ${filePath}:`, closeError);
+    });
+  }
+
+  return currentParsedData;
+};
+
 export async function POST(req: Request) {
   const { inputPath } = await req.json();
 
@@ -34,8 +162,6 @@ export async function POST(req: Request) {
   }
 
   let baseDir: string | null = null;
-  const allParsedNodes: Node[] = [];
-  const allParsedEdges: Edge[] = [];
 
   try {
     if (inputPath.startsWith("http")) {
@@ -43,13 +169,18 @@ export async function POST(req: Request) {
       const tempDir = await fs.mkdtemp(path.join(os.tmpdir(), "codeflow-"));
       baseDir = tempDir;
       console.log(`Cloning ${inputPath} into ${tempDir}`);
-      await simpleGit().clone(inputPath, tempDir);
+      // Only the checked-out tree is analyzed, so skip history, other branches and tags
+      await simpleGit().clone(inputPath, tempDir, [
+        "--depth",
+        "1",
+        "--single-branch",
+        "--no-tags",
+      ]);
     } else {
       // Local path
       baseDir = path.resolve(inputPath); // Resolve to absolute path
       try {
-        await fs.access(baseDir); // Check if local path exists
-        const stats = await fs.stat(baseDir);
+        const stats = await fs.stat(baseDir); // Rejects if the path doesn't exist
         if (!stats.isDirectory()) {
           return NextResponse.json(
             { error: `Provided local path is not a directory: ${baseDir}` },
@@ -70,13 +201,8 @@ export async function POST(req: Request) {
 
     // Define patterns to ignore
     const ignorePatterns: string[] = [
-      "node_modules",
-      ".git",
-      ".next",
-      "out", // Next.js export directory
-      "dist", // Common build directory
-      "build",
-      "coverage",
+      // `**/dir/**` lets globby prune these directories at any depth without reading them
+      ...IGNORED_DIRECTORIES.map((dir) => `**/${dir}/**`),
       "*.min.js", // Minified JS files
       "*.map", // Source maps
       "package.json",
@@ -104,55 +230,33 @@ export async function POST(req: Request) {
       "**/__tests__/**",
     ];
 
-    // Read .gitignore and add its entries
-    // Read .gitignore and add its entries
-    let gitignorePath = ""; // Declare outside try block
-    try {
-      gitignorePath = path.join(baseDir, ".gitignore"); // Assign value here
-      const gitignoreContent = await fs.readFile(gitignorePath, "utf-8");
-      const gitignoreLines = gitignoreContent
-        .split("\n")
-        .map((line) => line.trim())
-        .filter((line) => line && !line.startsWith("#"));
-      ignorePatterns.push(...gitignoreLines);
-    } catch (err) {
-      // Now gitignorePath is accessible
-      console.log("No .gitignore found or error reading it at", gitignorePath);
-      // No .gitignore, continue without it
-    }
+    ignorePatterns.push(...(await readGitignorePrunePatterns(baseDir)));
 
     // Find all relevant files using globby
     const filePaths = await globby(["**/*.{js,jsx,ts,tsx,py}"], {
       cwd: baseDir,
       ignore: ignorePatterns,
+      // Apply every .gitignore in the tree with git's own matching rules
+      // (anchoring, negation, nested files). This filters results and costs a
+      // separate walk for .gitignore files; the globs above do the pruning.
+      gitignore: true,
       onlyFiles: true,
       absolute: true,
     });
 
     console.log(`Found ${filePaths.length} relevant files.`);
 
-    // First Pass: Parse all files and collect raw nodes and edges
-    for (const filePath of filePaths) {
-      const relativeFilePath = path.relative(baseDir, filePath);
-      const fileExtension = path.extname(filePath);
-
-      try {
-        const fileContent = await fs.readFile(filePath, "utf-8");
-        let currentParsedData: ParsedData = { nodes: [], edges: [] };
-
-        if ([".js", ".jsx", ".ts", ".tsx"].includes(fileExtension)) {
-          currentParsedData = parseBabelCode(relativeFilePath, fileContent);
-        } else if ([".py"].includes(fileExtension)) {
-          currentParsedData = parsePythonCode(relativeFilePath, fileContent);
-        }
-        // Add other language parsers here as needed
-
-        allParsedNodes.push(...currentParsedData.nodes);
-        allParsedEdges.push(...currentParsedData.edges);
-      } catch (fileReadError) {
-        console.error(`Error processing file ${filePath}:`, fileReadError);
-      }
-    }
+    // First Pass: Parse all files and collect raw nodes and edges.
+    // Files are independent, so several are read/parsed concurrently.
+    const parsedFiles = await mapWithConcurrency(
+      filePaths,
+      FILE_CONCURRENCY,
+      (filePath) => analyzeFile(baseDir, filePath)
+    );
+    // Concatenate in one pass; push(...items) spreads every element as a call
+    // argument, which can overflow the stack for files with very many nodes
+    const allParsedNodes = parsedFiles.flatMap((parsed) => parsed.nodes);
+    const allParsedEdges = parsedFiles.flatMap((parsed) => parsed.edges);
 
     // Dedup nodes and edges after collecting all from parsers
     const uniqueNodes = uniqueItems(allParsedNodes);
@@ -166,8 +270,11 @@ export async function POST(req: Request) {
     // This is where we map rawTarget strings (like 'Button', './utils')
     // to actual node IDs within our uniqueNodes list.
 
-    const finalNodes: Node[] = [...uniqueNodes]; // Start with all unique nodes
+    // Start with all unique nodes. Nodes added below are guarded by nodeMap.has(),
+    // and each unique edge yields at most one final edge, so both stay unique.
+    const finalNodes: Node[] = uniqueNodes;
     const finalEdges: Edge[] = [];
+    const seenLinks = new Set<string>();
 
     // Create a map for quick lookup of nodes by their various identifiers
     // This includes file paths, function/class/component names within files.
@@ -186,6 +293,13 @@ export async function POST(req: Request) {
       }
     });
 
+    // Set/relative-path views of the file list so per-edge lookups don't rescan it
+    const filePathSet = new Set(filePaths);
+    const relativeFilePaths = filePaths.map((fp) => {
+      const relPath = path.relative(baseDir, fp);
+      return { relPath, lowerRelPath: relPath.toLowerCase() };
+    });
+
     for (const edge of uniqueEdges) {
       let resolvedTargetId = edge.target; // Start with the existing target
 
@@ -200,15 +314,14 @@ export async function POST(req: Request) {
           try {
             // Handle cases where the rawTarget might have a file extension
             const targetPathWithExt = path.resolve(path.dirname(path.join(baseDir, sourceFilePath)), edge.rawTarget);
-            if (filePaths.includes(targetPathWithExt)) {
+            if (filePathSet.has(targetPathWithExt)) {
               targetAbsolutePath = targetPathWithExt;
             } else {
               // Try common extensions if no extension in rawTarget
               const potentialExtensions = [".js", ".jsx", ".ts", ".tsx", ".py"];
               for (const ext of potentialExtensions) {
-                const targetPathWithoutExt = path.resolve(path.dirname(path.join(baseDir, sourceFilePath)), edge.rawTarget);
-                if (filePaths.includes(targetPathWithoutExt + ext)) {
-                  targetAbsolutePath = targetPathWithoutExt + ext;
+                if (filePathSet.has(targetPathWithExt + ext)) {
+                  targetAbsolutePath = targetPathWithExt + ext;
                   break;
                 }
               }
@@ -216,11 +329,10 @@ export async function POST(req: Request) {
 
             // Also check for index files in directories (e.g. import './components' -> './components/index.js')
             if (!targetAbsolutePath) {
-              const targetDir = path.resolve(path.dirname(path.join(baseDir, sourceFilePath)), edge.rawTarget);
               const potentialIndexFiles = ["index.js", "index.jsx", "index.ts", "index.tsx", "index.py"];
               for (const indexFile of potentialIndexFiles) {
-                const potentialIndexPath = path.join(targetDir, indexFile);
-                if (filePaths.includes(potentialIndexPath)) {
+                const potentialIndexPath = path.join(targetPathWithExt, indexFile);
+                if (filePathSet.has(potentialIndexPath)) {
                   targetAbsolutePath = potentialIndexPath;
                   break;
                 }
@@ -261,21 +373,19 @@ export async function POST(req: Request) {
             // try to find a file where this might be defined or exported
             // This is a weak link: it connects to the file that *defines* something with that label,
             // not necessarily where it's *imported from*.
-            const potentialFileNode = filePaths.find(fp => {
-              const relPath = path.relative(baseDir, fp);
+            const rawTarget = edge.rawTarget;
+            const lowerRawTarget = rawTarget.toLowerCase();
+            const potentialFileNode = relativeFilePaths.find(({ relPath, lowerRelPath }) => {
               // Basic check: does the filename contain the component/function name?
               // This is a very rough heuristic.
-              if (edge.rawTarget) {
-                return relPath.includes(edge.rawTarget) || relPath.toLowerCase().includes(edge.rawTarget.toLowerCase());
-              }
-              return false;
+              return relPath.includes(rawTarget) || lowerRelPath.includes(lowerRawTarget);
             });
 
             if (potentialFileNode) {
-                resolvedTargetId = path.relative(baseDir, potentialFileNode);
+                resolvedTargetId = potentialFileNode.relPath;
                 // Also add a new node for the component/function if it wasn't captured as an explicit node
                 // (e.g. if the parser didn't make a node for "Hero" component, just an edge TO "Hero")
-                if (!nodeMap.has(resolvedTargetId) && !uniqueNodes.some(n => n.id === resolvedTargetId)) {
+                if (!nodeMap.has(resolvedTargetId)) {
                     finalNodes.push({ id: resolvedTargetId, data: { label: resolvedTargetId, type: 'file' } });
                     nodeMap.set(resolvedTargetId, finalNodes[finalNodes.length - 1]);
                 }
@@ -295,29 +405,32 @@ export async function POST(req: Request) {
       // Add the resolved edge
       // Ensure source and target exist as nodes before adding edge
       if (nodeMap.has(edge.source) && nodeMap.has(resolvedTargetId)) {
+          // Different raw targets can resolve to the same node; keep one edge per link
+          const linkKey = `${edge.source}\0${resolvedTargetId}\0${edge.type}`;
+          if (seenLinks.has(linkKey)) {
+            continue;
+          }
+          seenLinks.add(linkKey);
           finalEdges.push({
             id: edge.id,
             source: edge.source,
             target: resolvedTargetId,
             type: edge.type,
-            label: edge.label,
-            rawTarget: edge.rawTarget, // Keep raw target for debugging if needed
+            // label always repeats type and rawTarget is only needed for resolution;
+            // leaving both out keeps the response small
           });
       } else {
           console.warn(`Dropped edge: Source '${edge.source}' or Target '${resolvedTargetId}' not found in nodes. Raw target: '${edge.rawTarget}'`);
       }
     }
 
-    const finalUniqueNodes = uniqueItems(finalNodes);
-    const finalUniqueEdges = uniqueItems(finalEdges);
-
     console.log(
-      `Final graph: ${finalUniqueNodes.length} nodes, ${finalUniqueEdges.length} edges`
+      `Final graph: ${finalNodes.length} nodes, ${finalEdges.length} edges`
     );
 
     return NextResponse.json({
-      nodes: finalUniqueNodes,
-      edges: finalUniqueEdges,
+      nodes: finalNodes,
+      edges: finalEdges,
     });
   } catch (error) {
     console.error("Analysis failed:", error);
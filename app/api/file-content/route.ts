@@ -2,12 +2,14 @@ import { NextRequest, NextResponse } from 'next/server';
 import { promises as fs } from 'fs';
 import path from 'path';
 
+// Captures owner and repo in one pass; a trailing ".git" is left outside the repo group
+const GITHUB_REPO_REGEX = /github\.com[/:]([^/]+)\/([^/]+?)(?:\.git)?(?:\/|$)/i;
+
 async function fetchFromGitHub(repoUrl: string, filePath: string, branch = 'main') {
   // Parse repo owner and name from URL
-  const match = repoUrl.match(/github.com[/:]([^/]+)\/([^/]+)(.git)?/i);
+  const match = GITHUB_REPO_REGEX.exec(repoUrl);
   if (!match) throw new Error('Invalid GitHub repo URL');
-  const owner = match[1];
-  const repo = match[2].replace(/.git$/, '');
+  const [, owner, repo] = match;
   // Try main, then master if main fails
   const branches = [branch, 'master'];
   let lastErr;
@@ -1,10 +1,31 @@
+import { createHash } from 'crypto';
 import { getOllamaModelName } from '@/lib/loadConfig';
+import { createLruMap } from '@/lib/lruMap';
+
+// Summaries are a pure function of model + file, so identical requests
+// (re-selecting a node, reloading) reuse the last result instead of
+// re-running the LLM.
+const MAX_CACHED_SUMMARIES = 256;
+const summaryCache = createLruMap<string, string>(MAX_CACHED_SUMMARIES);
+
+function summaryCacheKey(model: string, filename: string, code: string): string {
+  return createHash('sha256').update(`${model}\0${filename}\0${code}`).digest('hex');
+}
 
 export async function POST(req: Request) {
   try {
     const { code, filename } = await req.json();
     const model = getOllamaModelName();
 
+    const cacheKey = summaryCacheKey(model, filename, code);
+    const cachedSummary = summaryCache.get(cacheKey);
+    if (cachedSummary !== undefined) {
+      return new Response(JSON.stringify({ summary: cachedSummary }), {
+        status: 200,
+        headers: { 'Content-Type': 'application/json' },
+      });
+    }
+
     const prompt = `
     You are an AI code summarizer. Analyze the following code and summarize:
     - Its purpose in 2–3 lines
@@ -48,6 +69,10 @@ export async function POST(req: Request) {
       });
     }
 
+    if (typeof data.response === 'string') {
+      summaryCache.set(cacheKey, data.response);
+    }
+
     return new Response(JSON.stringify({ summary: data.response }), {
       status: 200,
       headers: { 'Content-Type': 'application/json' },
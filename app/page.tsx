@@ -4,11 +4,75 @@
 import React, { useState, useRef } from "react";
 import Graph from "@/components/Graph";
 import DirectoryTree, { DirectoryNode } from "@/components/DirectoryTree";
-import { ParsedData, Node } from "@/lib/parsers/babel";
+import { ParsedData, Node } from "@/lib/parsers/types";
 import { Prism as SyntaxHighlighter } from "react-syntax-highlighter";
 import { oneDark } from "react-syntax-highlighter/dist/esm/styles/prism";
 import CodeSummary from "@/components/CodeSummary";
 
+// Normalize Windows-style separators; most labels have none, so skip the copy
+const toPosixPath = (filePath: string): string =>
+  filePath.includes("\\") ? filePath.replaceAll("\\", "/") : filePath;
+
+// Syntax highlighter language for each file extension
+const LANGUAGE_BY_EXTENSION = new Map<string, string>([
+  ["js", "javascript"],
+  ["ts", "typescript"],
+  ["tsx", "tsx"],
+  ["jsx", "jsx"],
+  ["py", "python"],
+  ["java", "java"],
+  ["c", "c"],
+  ["cpp", "cpp"],
+  ["cs", "csharp"],
+  ["json", "json"],
+  ["css", "css"],
+  ["html", "html"],
+  ["md", "markdown"],
+  ["go", "go"],
+  ["rb", "ruby"],
+  ["php", "php"],
+  ["sh", "bash"],
+  ["yml", "yaml"],
+  ["yaml", "yaml"],
+]);
+
+// Utility: Guess language from file extension
+function getLanguageFromFilename(filename: string): string {
+  const ext = filename.split(".").pop()?.toLowerCase();
+  return (ext && LANGUAGE_BY_EXTENSION.get(ext)) || "text";
+}
+
+// Utility: Convert flat file list to directory tree
+function buildDirectoryTree(files: string[]): DirectoryNode[] {
+  const root: DirectoryNode[] = [];
+  // Every node created so far, by path. Children arrays are filled in place,
+  // so the tree is complete after one pass with no object -> array conversion.
+  const nodesByPath = new Map<string, DirectoryNode>();
+  for (const file of files) {
+    const parts = file.split("/");
+    let siblings = root;
+    let path = "";
+    for (let i = 0; i < parts.length; i++) {
+      const part = parts[i];
+      path = path ? path + "/" + part : part;
+      let node = nodesByPath.get(path);
+      if (!node) {
+        node = {
+          name: part,
+          path,
+          ...(i < parts.length - 1 ? { children: [] } : {}),
+        };
+        nodesByPath.set(path, node);
+        siblings.push(node);
+      }
+      if (i < parts.length - 1) {
+        siblings = node.children ?? [];
+      }
+    }
+  }
+  return root;
+}
+
 const HomePage: React.FC = () => {
   const [inputPath, setInputPath] = useState<string>("");
   const [graphData, setGraphData] = useState<ParsedData | null>(null);
@@ -90,7 +154,7 @@ const HomePage: React.FC = () => {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({
-            filePath: node.data.label.replace(/\\/g, "/"),
+            filePath: toPosixPath(node.data.label),
             repoUrl: repoUrl || undefined,
           }),
         });
@@ -111,42 +175,18 @@ const HomePage: React.FC = () => {
     }
   };
 
-  // Utility: Convert flat file list to directory tree
-  function buildDirectoryTree(files: string[]): DirectoryNode[] {
-    const root: { [key: string]: DirectoryNode } = {};
-    for (const file of files) {
-      const parts = file.split("/");
-      let current = root;
-      let path = "";
-      for (let i = 0; i < parts.length; i++) {
-        const part = parts[i];
-        path = path ? path + "/" + part : part;
-        if (!current[part]) {
-          current[part] = {
-            name: part,
-            path,
-            ...(i < parts.length - 1 ? { children: {} } : {}),
-          } as DirectoryNode;
-        }
-        if (i < parts.length - 1) {
-          current = current[part].children as any;
-        }
-      }
-    }
-    // Recursively convert children objects to arrays
-    function toArray(obj: any): DirectoryNode[] {
-      return Object.values(obj).map((node: any) =>
-        node.children ? { ...node, children: toArray(node.children) } : node
-      );
-    }
-    return toArray(root);
-  }
-
-  // Extract file nodes from graphData
-  const fileNodes = graphData?.nodes.filter((n: Node) => n.data.type === "file");
-  // Normalize file paths to use forward slashes for directory tree
-  const filePaths = fileNodes?.map((n: Node) => n.data.label.replace(/\\/g, "/")) || [];
-  const directoryTree = buildDirectoryTree(filePaths);
+  // Derive file nodes and the directory tree only when the graph changes,
+  // not on every preview/summary state update
+  const { fileNodes, fileNodesByPath, directoryTree } = React.useMemo(() => {
+    // Extract file nodes from graphData
+    const fileNodes = graphData?.nodes.filter((n: Node) => n.data.type === "file");
+    // Index file nodes by forward-slash path for directory tree lookups
+    const fileNodesByPath = new Map(
+      fileNodes?.map((n: Node) => [toPosixPath(n.data.label), n] as const)
+    );
+    const directoryTree = buildDirectoryTree(Array.from(fileNodesByPath.keys()));
+    return { fileNodes, fileNodesByPath, directoryTree };
+  }, [graphData]);
 
 
   // Export graph as SVG
@@ -178,32 +218,6 @@ const HomePage: React.FC = () => {
     }
   };
 
-  // Utility: Guess language from file extension
-  function getLanguageFromFilename(filename: string): string {
-    const ext = filename.split(".").pop()?.toLowerCase();
-    switch (ext) {
-      case "js": return "javascript";
-      case "ts": return "typescript";
-      case "tsx": return "tsx";
-      case "jsx": return "jsx";
-      case "py": return "python";
-      case "java": return "java";
-      case "c": return "c";
-      case "cpp": return "cpp";
-      case "cs": return "csharp";
-      case "json": return "json";
-      case "css": return "css";
-      case "html": return "html";
-      case "md": return "markdown";
-      case "go": return "go";
-      case "rb": return "ruby";
-      case "php": return "php";
-      case "sh": return "bash";
-      case "yml": case "yaml": return "yaml";
-      default: return "text";
-    }
-  }
-
   return (
     <div className="min-h-screen flex flex-col items-center p-6 bg-gray-100 text-gray-800">
       <h1 className="text-3xl font-bold mb-6">Codebase Visualizer</h1>
@@ -274,7 +288,7 @@ const HomePage: React.FC = () => {
           <div className="w-80 h-full border-l border-gray-200 bg-gray-50 overflow-auto">
             <h3 className="fixed-top text-lg font-semibold p-4 border-b border-gray-200">Directory Structure</h3>
             <DirectoryTree tree={directoryTree} onFileClick={(filePath) => {
-              const node = fileNodes?.find((n: Node) => n.data.label.replace(/\\/g, "/") === filePath);
+              const node = fileNodesByPath.get(filePath);
               console.log('[DirectoryTree] Clicked filePath:', filePath);
               if (node) {
                 console.log('[DirectoryTree] Found node for filePath:', node.id, node);
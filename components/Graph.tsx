@@ -3,7 +3,7 @@
 
 import React, { useRef, useEffect, useCallback, useImperativeHandle, forwardRef } from "react";
 import * as d3 from "d3";
-import { Node, Edge } from "@/lib/parsers/babel";
+import { Node, Edge } from "@/lib/parsers/types";
 
 interface GraphProps {
   graphData: {
@@ -18,6 +18,17 @@ interface GraphProps {
 interface D3Node extends d3.SimulationNodeDatum, Node {}
 interface D3Edge extends d3.SimulationLinkDatum<D3Node>, Edge {}
 
+// Fill color per node type (see "Node Types & Color Reference" in README.md)
+const NODE_COLORS: Record<Node["data"]["type"], string> = {
+  file: "#69b3a2",
+  function: "#4285F4",
+  class: "#DB4437",
+  component: "#F4B400",
+  export: "#0F9D58",
+  import: "#9e5fba",
+};
+const DEFAULT_NODE_COLOR = "#ccc";
+
 const Graph = forwardRef<
   { focusNode: (nodeId: string) => void },
   GraphProps
@@ -30,7 +41,7 @@ const Graph = forwardRef<
   const zoomTransformRef = useRef<d3.ZoomTransform | null>(null);
   const zoomGroupRef = useRef<SVGGElement | null>(null);
   const d3ZoomRef = useRef<d3.ZoomBehavior<SVGSVGElement, unknown> | null>(null);
-  const nodesDataRef = useRef<D3Node[]>([]);
+  const nodesByIdRef = useRef<Map<string, D3Node>>(new Map());
 
   const dragstarted = useCallback(
     (event: d3.D3DragEvent<any, D3Node, any>) => {
@@ -89,7 +100,7 @@ const Graph = forwardRef<
       vx: (node as any).vx ?? 0,
       vy: (node as any).vy ?? 0,
     }));
-    nodesDataRef.current = nodesData;
+    nodesByIdRef.current = new Map(nodesData.map((node) => [node.id, node]));
     const edgesData: D3Edge[] = graphData.edges.map((edge) => ({
       ...edge,
       source: edge.source,
@@ -170,17 +181,7 @@ const Graph = forwardRef<
     nodeGroup
       .append("circle")
       .attr("r", 7)
-      .attr("fill", (d) => {
-        switch (d.data.type) {
-          case "file": return "#69b3a2";
-          case "function": return "#4285F4";
-          case "class": return "#DB4437";
-          case "component": return "#F4B400";
-          case "export": return "#0F9D58";
-          case "import": return "#9e5fba";
-          default: return "#ccc";
-        }
-      })
+      .attr("fill", (d) => NODE_COLORS[d.data.type] ?? DEFAULT_NODE_COLOR)
       .attr("stroke", "#fff")
       .attr("stroke-width", 1.5);
 
@@ -233,10 +234,10 @@ const Graph = forwardRef<
   useImperativeHandle(ref, () => ({
     focusNode: (nodeId: string) => {
       if (!svgRef.current || !zoomGroupRef.current || !d3ZoomRef.current) return;
-      const node = nodesDataRef.current.find((n) => n.id === nodeId);
+      const node = nodesByIdRef.current.get(nodeId);
       console.log('[Graph] focusNode called with nodeId:', nodeId);
       if (!node) {
-        console.warn('[Graph] No node found for id:', nodeId, 'Available node ids:', nodesDataRef.current.map(n => n.id));
+        console.warn('[Graph] No node found for id:', nodeId, 'Available node ids:', Array.from(nodesByIdRef.current.keys()));
         return;
       }
       if (typeof node.x !== "number" || typeof node.y !== "number") {
@@ -0,0 +1,37 @@
+// lib/lruMap.ts
+
+export interface LruMap<K, V> {
+  get(key: K): V | undefined;
+  set(key: K, value: V): void;
+}
+
+/**
+ * Creates an in-memory map holding at most `maxEntries` values. Reads and
+ * writes mark an entry as most recently used; inserting past the limit
+ * evicts the least recently used entries.
+ */
+export function createLruMap<K, V>(maxEntries: number): LruMap<K, V> {
+  // Map preserves insertion order, so re-inserting on access keeps the most
+  // recently used entries at the end and the eviction candidates at the front
+  const entries = new Map<K, V>();
+
+  return {
+    get(key) {
+      const value = entries.get(key);
+      if (value !== undefined) {
+        entries.delete(key);
+        entries.set(key, value);
+      }
+      return value;
+    },
+    set(key, value) {
+      entries.delete(key);
+      entries.set(key, value);
+      while (entries.size > maxEntries) {
+        const oldest = entries.keys().next().value;
+        if (oldest === undefined) break;
+        entries.delete(oldest);
+      }
+    },
+  };
+}
@@ -0,0 +1,160 @@
+// lib/parseCache.ts
+import { createHash } from "crypto";
+import fs from "fs/promises";
+import os from "os";
+import path from "path";
+import { ParsedData } from "@/lib/parsers/types";
+import { PARSER_VERSION } from "@/lib/parsers";
+import { createLruMap } from "@/lib/lruMap";
+
+// Upper bound on cached files held in memory; oldest entries are evicted first.
+const MAX_ENTRIES = 5000;
+
+// Parse results also persist across server restarts as one JSON file per entry.
+// Entries are content-addressed, so the directory can be deleted at any time.
+const CACHE_DIR = path.join(
+  process.env.XDG_CACHE_HOME || path.join(os.homedir(), ".cache"),
+  "codeflow",
+  "parse"
+);
+
+// Upper bound on entries kept on disk. Sweeps delete the least recently used
+// entries (by mtime, refreshed on every disk hit) beyond this count.
+const MAX_DISK_ENTRIES = 20000;
+
+// Sweep on the first write of each process and then after every this many
+// writes, so a large analysis pays for one directory scan rather than one per file
+const DISK_SWEEP_INTERVAL = 500;
+
+// Keyed by `${filePath}\0${sha256(content)}`
+const cache = createLruMap<string, ParsedData>(MAX_ENTRIES);
+
+export function hashContent(content: string | Uint8Array): string {
+  return createHash("sha256").update(content).digest("hex");
+}
+
+const cacheKey = (filePath: string, digest: string) => `${filePath}\0${digest}`;
+
+// Node ids embed the file path, so it is part of the on-disk key as well
+const cacheFilePath = (key: string) =>
+  path.join(CACHE_DIR, `${hashContent(`${PARSER_VERSION}\0${key}`)}.json`);
+
+/**
+ * Returns the parse result previously stored for this file path and content
+ * digest, or undefined if the file has not been parsed with this content.
+ * Checks memory first, then the on-disk cache.
+ */
+export async function getCachedParse(
+  filePath: string,
+  digest: string
+): Promise<ParsedData | undefined> {
+  const key = cacheKey(filePath, digest);
+  const hit = cache.get(key);
+  if (hit) {
+    return hit;
+  }
+
+  try {
+    const entryPath = cacheFilePath(key);
+    const stored = JSON.parse(await fs.readFile(entryPath, "utf-8"));
+    // Valid JSON is not necessarily a complete entry (truncated or edited by hand)
+    if (!Array.isArray(stored?.nodes) || !Array.isArray(stored?.edges)) {
+      return undefined;
+    }
+    cache.set(key, stored as ParsedData);
+    // Mark the entry as recently used so the disk sweep keeps it
+    const now = new Date();
+    fs.utimes(entryPath, now, now).catch(() => {});
+    return stored;
+  } catch {
+    // Missing or unreadable entry: treat as a miss
+    return undefined;
+  }
+}
+
+// Set after the first failed write (e.g. a read-only home directory) so the
+// rest of the process skips persisting instead of failing on every miss
+let diskWritesDisabled = false;
+
+let writesSinceSweep = DISK_SWEEP_INTERVAL - 1;
+let sweeping = false;
+
+// Temp files older than this were left by a process that died between write
+// and rename; no in-flight write takes anywhere near this long
+const STALE_TEMP_AGE_MS = 10 * 60 * 1000;
+
+const statEntries = (names: string[]) =>
+  Promise.all(
+    names.map(async (name) => {
+      const entryPath = path.join(CACHE_DIR, name);
+      try {
+        return { entryPath, mtimeMs: (await fs.stat(entryPath)).mtimeMs };
+      } catch {
+        // Removed concurrently; nothing left to evict
+        return undefined;
+      }
+    })
+  ).then((entries) =>
+    entries.filter(
+      (entry): entry is { entryPath: string; mtimeMs: number } => !!entry
+    )
+  );
+
+const removeEntries = (entries: { entryPath: string }[]) =>
+  Promise.all(entries.map(({ entryPath }) => fs.rm(entryPath, { force: true })));
+
+// Deletes stale temp files and the least recently used disk entries beyond
+// MAX_DISK_ENTRIES
+const sweepDiskCache = async () => {
+  const names = await fs.readdir(CACHE_DIR);
+
+  const staleBefore = Date.now() - STALE_TEMP_AGE_MS;
+  const temps = await statEntries(names.filter((name) => name.endsWith(".tmp")));
+  await removeEntries(temps.filter(({ mtimeMs }) => mtimeMs < staleBefore));
+
+  const entryNames = names.filter((name) => name.endsWith(".json"));
+  if (entryNames.length <= MAX_DISK_ENTRIES) return;
+  const entries = await statEntries(entryNames);
+  entries.sort((a, b) => a.mtimeMs - b.mtimeMs);
+  await removeEntries(entries.slice(0, entries.length - MAX_DISK_ENTRIES));
+};
+
+const scheduleDiskSweep = () => {
+  writesSinceSweep++;
+  if (sweeping || writesSinceSweep < DISK_SWEEP_INTERVAL) return;
+  writesSinceSweep = 0;
+  sweeping = true;
+  sweepDiskCache()
+    .catch((err) => console.warn("Could not sweep parse cache:", err))
+    .finally(() => {
+      sweeping = false;
+    });
+};
+
+export function setCachedParse(
+  filePath: string,
+  digest: string,
+  data: ParsedData
+): void {
+  const key = cacheKey(filePath, digest);
+  cache.set(key, data);
+  if (diskWritesDisabled) return;
+
+  // Persist in the background; write to a temp file and rename so readers
+  // never see a partial entry. Failures only cost a future cache miss.
+  const target = cacheFilePath(key);
+  const temp = `${target}.${process.pid}.${Date.now()}.tmp`;
+  fs.mkdir(CACHE_DIR, { recursive: true })
+    .then(() => fs.writeFile(temp, JSON.stringify(data)))
+    .then(() => fs.rename(temp, target))
+    .then(scheduleDiskSweep)
+    .catch((err) => {
+      fs.rm(temp, { force: true }).catch(() => {});
+      if (diskWritesDisabled) return;
+      diskWritesDisabled = true;
+      console.warn(
+        `Could not persist parse cache entry; disk cache writes disabled for this process (${CACHE_DIR}):`,
+        err
+      );
+    });
+}
@@ -1,38 +1,153 @@
 // lib/parser/babel.ts
 import * as parser from "@babel/parser";
-import traverse from "@babel/traverse";
+import traverse, { TraverseOptions } from "@babel/traverse";
 import * as t from "@babel/types"; // Import Babel types
+import { Node, Edge, ParsedData } from "./types";
 
-// Extend Node to support D3 simulation properties
-export interface Node {
-  id: string;
-  data: {
-    label: string;
-    type: "file" | "class" | "component" | "import" | "export" | "function";
-    filePath?: string;
-  };
-  position?: { x: number; y: number };
-  // D3 simulation properties (optional)
-  x?: number;
-  y?: number;
-  vx?: number;
-  vy?: number;
-}
+// Shared by every file; Babel only reads these options, so one object is enough
+const PARSER_OPTIONS: parser.ParserOptions = {
+  sourceType: "module", // Treat as ES module
+  plugins: [
+    "jsx",
+    "typescript",
+    "dynamicImport",
+    "importAssertions",
+    "decorators-legacy", // Common for frameworks like Angular/NestJS (if applicable)
+    "classProperties", // For class field declarations
+    "privateMethods",
+    "numericSeparator",
+    "optionalChaining",
+    "nullishCoalescingOperator",
+  ],
+  allowAwaitOutsideFunction: true, // For top-level await
+  attachComment: false, // Comments are never read; skip attaching them to nodes
+};
 
-export interface Edge {
-  id: string;
-  source: string;
-  target: string;
-  type: "renders" | "defines";
-  label?: string;
-  rawTarget?: string;
-}
+// Lowercase HTML/SVG tag names that are never treated as components.
+// Built once so each JSX element is a single Set lookup.
+const INTRINSIC_ELEMENTS = new Set([
+  "div",
+  "span",
+  "img",
+  "a",
+  "p",
+  "h1",
+  "h2",
+  "h3",
+  "h4",
+  "h5",
+  "h6",
+  "button",
+  "input",
+  "form",
+  "ul",
+  "ol",
+  "li",
+  "table",
+  "tr",
+  "td",
+  "th",
+  "svg",
+  "path",
+  "g",
+  "circle",
+  "rect",
+  "line",
+  "text",
+]);
 
-export interface ParsedData {
+// Per-file state threaded through the shared visitor below
+interface VisitorState {
+  filePath: string;
   nodes: Node[];
   edges: Edge[];
+  renderedComponents: Set<string>;
 }
 
+// One visitor object for every file: @babel/traverse explodes and validates a
+// visitor on first use and caches the result on the object itself.
+const VISITOR: TraverseOptions<VisitorState> = {
+  // Handlers only read node shapes, never bindings, so skip building scopes
+  noScope: true,
+
+  // 1. Handle Import Declarations (file-level imports)
+  //   ImportDeclaration(path) {
+  //     const importedModule = path.node.source.value;
+  //     const importEdgeId = `${filePath}-imports-${importedModule}-${path.node.start}`;
+
+  //     edges.push({
+  //       id: importEdgeId,
+  //       source: filePath,
+  //       target: importedModule, // This target needs resolution in the API handler
+  //       type: "imports",
+  //       label: "imports",
+  //       rawTarget: importedModule,
+  //     });
+  //   },
+
+
+  ClassDeclaration(path, state) {
+    const { filePath, nodes, edges } = state;
+    if (path.node.id) {
+      const className = path.node.id.name;
+      const classId = `${filePath}#${className}`;
+
+      nodes.push({
+        id: classId,
+        data: { label: className, type: "class", filePath: filePath },
+      });
+      edges.push({
+        id: `${filePath}-defines-class-${classId}`,
+        source: filePath,
+        target: classId,
+        type: "defines",
+        label: "defines",
+        rawTarget: classId,
+      });
+    }
+  },
+
+  JSXOpeningElement(path, state) {
+    const { filePath, edges, renderedComponents } = state;
+    let componentName: string | null = null;
+
+    if (t.isJSXIdentifier(path.node.name)) {
+      componentName = path.node.name.name;
+    } else if (t.isJSXMemberExpression(path.node.name)) {
+      let current: t.JSXMemberExpression | t.JSXIdentifier = path.node.name;
+      const parts: string[] = [];
+      while (t.isJSXMemberExpression(current)) {
+        parts.unshift(current.property.name);
+        current = current.object;
+      }
+      if (t.isJSXIdentifier(current)) {
+        parts.unshift(current.name);
+      }
+      componentName = parts.join(".");
+    }
+
+    if (componentName) {
+      if (
+        componentName[0] === componentName[0].toUpperCase() &&
+        !INTRINSIC_ELEMENTS.has(componentName.toLowerCase()) &&
+        !renderedComponents.has(componentName)
+      ) {
+        // One edge per component per file, however many times it is rendered
+        renderedComponents.add(componentName);
+        const renderEdgeId = `${filePath}-renders-${componentName}`;
+        edges.push({
+          id: renderEdgeId,
+          source: filePath,
+          target: componentName, // Raw component name, needs resolution
+          type: "renders",
+          label: "renders",
+          rawTarget: componentName,
+        });
+      }
+    }
+  },
+};
+
 /**
  * Parses JavaScript/TypeScript/JSX/TSX code using Babel to extract
  * file-level imports/exports, function/class definitions/calls, and JSX component usage.
@@ -55,124 +170,13 @@ export const parseBabelCode = (
   });
 
   try {
-    const ast = parser.parse(code, {
-      sourceType: "module", // Treat as ES module
-      plugins: [
-        "jsx",
-        "typescript",
-        "dynamicImport",
-        "importAssertions",
-        "decorators-legacy", // Common for frameworks like Angular/NestJS (if applicable)
-        "classProperties", // For class field declarations
-        "privateMethods",
-        "numericSeparator",
-        "optionalChaining",
-        "nullishCoalescingOperator",
-      ],
-      allowAwaitOutsideFunction: true, // For top-level await
-    });
+    const ast = parser.parse(code, PARSER_OPTIONS);
 
-    traverse(ast, {
-      // 1. Handle Import Declarations (file-level imports)
-    //   ImportDeclaration(path) {
-    //     const importedModule = path.node.source.value;
-    //     const importEdgeId = `${filePath}-imports-${importedModule}-${path.node.start}`;
-
-    //     edges.push({
-    //       id: importEdgeId,
-    //       source: filePath,
-    //       target: importedModule, // This target needs resolution in the API handler
-    //       type: "imports",
-    //       label: "imports",
-    //       rawTarget: importedModule,
-    //     });
-    //   },
-
-
-      ClassDeclaration(path) {
-        if (path.node.id) {
-          const className = path.node.id.name;
-          const classId = `${filePath}#${className}`;
-
-          nodes.push({
-            id: classId,
-            data: { label: className, type: "class", filePath: filePath },
-          });
-          edges.push({
-            id: `${filePath}-defines-class-${classId}`,
-            source: filePath,
-            target: classId,
-            type: "defines",
-            label: "defines",
-            rawTarget: classId,
-          });
-        }
-      },
-
-      JSXOpeningElement(path) {
-        let componentName: string | null = null;
-
-        if (t.isJSXIdentifier(path.node.name)) {
-          componentName = path.node.name.name;
-        } else if (t.isJSXMemberExpression(path.node.name)) {
-          let current: t.JSXMemberExpression | t.JSXIdentifier = path.node.name;
-          const parts: string[] = [];
-          while (t.isJSXMemberExpression(current)) {
-            parts.unshift(current.property.name);
-            current = current.object;
-          }
-          if (t.isJSXIdentifier(current)) {
-            parts.unshift(current.name);
-          }
-          componentName = parts.join(".");
-        }
-
-        if (componentName) {
-          if (
-            componentName[0] === componentName[0].toUpperCase() &&
-            ![
-              "div",
-              "span",
-              "img",
-              "a",
-              "p",
-              "h1",
-              "h2",
-              "h3",
-              "h4",
-              "h5",
-              "h6",
-              "button",
-              "input",
-              "form",
-              "ul",
-              "ol",
-              "li",
-              "table",
-              "tr",
-              "td",
-              "th",
-              "svg",
-              "path",
-              "g",
-              "circle",
-              "rect",
-              "line",
-              "text",
-           ].includes(componentName.toLowerCase())
-          ) {
-            const renderEdgeId = `${filePath}-renders-${componentName}-${path.node.start}`;
-            edges.push({
-              id: renderEdgeId,
-              source: filePath,
-              target: componentName, // Raw component name, needs resolution
-              type: "renders",
-              label: "renders",
-              rawTarget: componentName,
-            });
-          }
-        }
-      },
+    traverse(ast, VISITOR, undefined, {
+      filePath,
+      nodes,
+      edges,
+      renderedComponents: new Set<string>(),
     });
   } catch (error) {
     console.error(`Error parsing ${filePath}:`, error);
@@ -0,0 +1,29 @@
+// lib/parsers/index.ts
+import { ParsedData } from "./types";
+import { parseBabelCode } from "./babel";
+import { parsePythonCode } from "./python";
+
+export type { Node, Edge, ParsedData } from "./types";
+
+// Bump whenever parser output changes so persisted parse-cache entries are ignored
+export const PARSER_VERSION = 1;
+
+export type CodeParser = (filePath: string, code: string) => ParsedData;
+
+// Parser for each supported file extension.
+// Add other language parsers here as needed.
+const PARSERS_BY_EXTENSION = new Map<string, CodeParser>([
+  [".js", parseBabelCode],
+  [".jsx", parseBabelCode],
+  [".ts", parseBabelCode],
+  [".tsx", parseBabelCode],
+  [".py", parsePythonCode],
+]);
+
+/**
+ * Returns the parser registered for a file extension (including the dot),
+ * or undefined if the language is not supported.
+ */
+export const getParserForExtension = (
+  extension: string
+): CodeParser | undefined => PARSERS_BY_EXTENSION.get(extension);
@@ -1,5 +1,17 @@
 // lib/parser/python.ts
-import { Node, Edge, ParsedData } from "./babel"; // Re-using interfaces for consistency
+import { Node, Edge, ParsedData } from "./types";
+
+// Every construct the parser cares about starts a line, so one multiline
+// alternation finds all of them in a single scan of the file. Compiled once per
+// module load; matchAll() clones it per call, so its shared `lastIndex` is never
+// touched. Capture groups:
+// 1. 'def function_name(', including async def. Only the name is captured, so
+//    multi-line parameter lists and return annotations ('-> int:') still match.
+// 2. 'class ClassName:', 'class ClassName(' (bases may span lines) or 'class ClassName[T]'
+// 3. 'import module' / 'import module as alias'
+// 4. 'from package import ...' (names, '*', or a parenthesized multi-line list)
+const DECLARATION_REGEX =
+  /^\s*(?:(?:async\s+)?def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(|class\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[(:[]|import\s+([a-zA-Z_][a-zA-Z0-9_.]*)|from\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s+import\b)/gm;
 
 /**
  * Parses Python code to extract file-level imports, function definitions,
@@ -26,78 +38,63 @@ export const parsePythonCode = (
   });
 
   try {
-    // 1. Function Definitions
-    // Regex for 'def function_name(...):'
-    // Also captures async def
-    const functionDefRegex = /^\s*(?:async\s+)?def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(.*?\)\s*:/gm;
-    let funcDefMatch;
-    while ((funcDefMatch = functionDefRegex.exec(code)) !== null) {
-      const functionName = funcDefMatch[1];
-      const functionId = `${filePath}#${functionName}`;
-
-      nodes.push({
-        id: functionId,
-        data: { label: functionName, type: "function", filePath },
-      });
-      edges.push({
-        id: `${filePath}-defines-func-${functionId}`,
-        source: filePath,
-        target: functionId,
-        type: "defines",
-        label: "defines",
-        rawTarget: functionId,
-      });
-    }
+    // Several statements often import from the same module
+    // ('from x import a' ... 'from x import b'); emit one edge per module.
+    const importedModules = new Set<string>();
 
-    // 2. Class Definitions
-    // Regex for 'class ClassName(...):'
-    const classDefRegex = /^\s*class\s+([a-zA-Z_][a-zA-Z0-9_]*)(?:\s*\(.*\))?\s*:/gm;
-    let classDefMatch;
-    while ((classDefMatch = classDefRegex.exec(code)) !== null) {
-      const className = classDefMatch[1];
-      const classId = `${filePath}#${className}`;
+    for (const match of code.matchAll(DECLARATION_REGEX)) {
+      const [, functionName, className, importModule, fromModule] = match;
 
-      nodes.push({
-        id: classId,
-        data: { label: className, type: "class", filePath },
-      });
-      edges.push({
-        id: `${filePath}-defines-class-${classId}`,
-        source: filePath,
-        target: classId,
-        type: "defines",
-        label: "defines",
-        rawTarget: classId,
-      });
-    }
-
-    // 3. Imports and From-Imports
-    // Covers:
-    // - import module
-    // - import module as alias
-    // - from package import module
-    // - from package import module as alias
-    // - from package import *
-    const importRegex =
-      /^\s*(?:import\s+([a-zA-Z_][a-zA-Z0-9_.]*)(?:\s+as\s+[a-zA-Z_][a-zA-Z0-9_]*)?|from\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s+import\s+(?:[a-zA-Z_][a-zA-Z0-9_]*(?:\s+as\s+[a-zA-Z_][a-zA-Z0-9_]*)?(?:,\s*[a-zA-Z_][a-zA-Z0-9_]*(?:\s+as\s+[a-zA-Z_][a-zA-Z0-9_]*)?)*|\*))/gm;
+      if (functionName) {
+        // 1. Function Definitions
+        const functionId = `${filePath}#${functionName}`;
 
-    let importMatch;
-    while ((importMatch = importRegex.exec(code)) !== null) {
-      const fullImportPath = importMatch[1] || importMatch[2];
+        nodes.push({
+          id: functionId,
+          data: { label: functionName, type: "function", filePath },
+        });
+        edges.push({
+          id: `${filePath}-defines-func-${functionId}`,
+          source: filePath,
+          target: functionId,
+          type: "defines",
+          label: "defines",
+          rawTarget: functionId,
+        });
+      } else if (className) {
+        // 2. Class Definitions
+        const classId = `${filePath}#${className}`;
 
-      if (fullImportPath) {
-        // Python relative imports start with '.' or '..'
-        // For accurate resolution, these also need the base directory context.
-        // We will store the raw target and resolve in API handler.
-        const importEdgeId = `${filePath}-imports-${fullImportPath}-${importMatch.index}`;
+        nodes.push({
+          id: classId,
+          data: { label: className, type: "class", filePath },
+        });
         edges.push({
-          id: `${filePath}-imports-${fullImportPath}-${importMatch.index}`,
+          id: `${filePath}-defines-class-${classId}`,
           source: filePath,
-          target: fullImportPath,
-          type: "imports",
-          label: "imports",
-          rawTarget: fullImportPath,
+          target: classId,
+          type: "defines",
+          label: "defines",
+          rawTarget: classId,
         });
+      } else {
+        // 3. Imports and From-Imports
+        const fullImportPath = importModule || fromModule;
+
+        if (fullImportPath && !importedModules.has(fullImportPath)) {
+          importedModules.add(fullImportPath);
+          // Python relative imports start with '.' or '..'
+          // For accurate resolution, these also need the base directory context.
+          // We will store the raw target and resolve in API handler.
+          edges.push({
+            id: `${filePath}-imports-${fullImportPath}`,
+            source: filePath,
+            target: fullImportPath,
+            type: "imports",
+            label: "imports",
+            rawTarget: fullImportPath,
+          });
+        }
       }
     }
 
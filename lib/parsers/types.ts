@@ -0,0 +1,32 @@
+// lib/parsers/types.ts
+// Graph data shared by all language parsers, the API routes, and the UI.
+
+// Extend Node to support D3 simulation properties
+export interface Node {
+  id: string;
+  data: {
+    label: string;
+    type: "file" | "class" | "component" | "import" | "export" | "function";
+    filePath?: string;
+  };
+  position?: { x: number; y: number };
+  // D3 simulation properties (optional)
+  x?: number;
+  y?: number;
+  vx?: number;
+  vy?: number;
+}
+
+export interface Edge {
+  id: string;
+  source: string;
+  target: string;
+  type: "renders" | "defines" | "imports";
+  label?: string;
+  rawTarget?: string;
+}
+
+export interface ParsedData {
+  nodes: Node[];
+  edges: Edge[];
+}